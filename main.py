@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 from services.llm_extractor import build_forward_package
 from services.calendar_generator import detect_event_and_build_ics, build_ics_from_calendar_event
 from services.mail_sender import send_forward_email
+from services.email_classifier import get_routing_stats
 
 
 # Load .env for local dev ONLY; Render uses Dashboard env vars
@@ -27,6 +28,11 @@ async def health():
     return {"ok": True}
 
 
+@app.get("/stats")
+async def stats():
+    return {"routing": get_routing_stats()}
+
+
 @app.post("/email/webhook")
 async def handle_incoming_email(request: Request):
     form_data = await request.form()
@@ -1,7 +1,10 @@
 # email_assistant/services/calendar_generator.py
 import re
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import dateparser
 from dateparser.search import search_dates
@@ -79,38 +82,252 @@ def detect_event(subject: str, body: str) -> Optional[Dict[str, Any]]:
     }
 
 
-def _dt_to_ics(dt: datetime) -> str:
-    # MVP: emit as Zulu format without strict TZ conversion
-    return dt.strftime("%Y%m%dT%H%M%SZ")
+# -----------------------------
+# ICS (RFC 5545) builder
+# -----------------------------
+PRODID = "-//Zijin Assistant//EN"
+UID_DOMAIN = "zijin-assistant"
 
+_ICS_ESCAPE_RE = re.compile(r"([\\;,])")
+_ICS_NEWLINE_RE = re.compile(r"\r\n|\r|\n")
+_ICS_FOLD_OCTETS = 75
 
-def build_ics_from_event(event: Dict[str, Any]) -> str:
-    uid = datetime.utcnow().strftime("%Y%m%dT%H%M%S") + "@zijin-assistant"
-    now_utc = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+_CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    f"PRODID:{PRODID}",
+    "CALSCALE:GREGORIAN",
+    "METHOD:PUBLISH",
+)
+_CALENDAR_FOOTER = ("END:VCALENDAR",)
 
-    dtstart = _dt_to_ics(event["start"])
-    dtend = _dt_to_ics(event["end"])
 
-    summary = (event.get("title") or "Event").replace("\n", " ").strip()
-    location = (event.get("location") or "").replace("\n", " ").strip()
-    description = (event.get("description") or "").replace("\n", " ").strip()
+def _ics_escape(value: str) -> str:
+    """Escape a TEXT value (RFC 5545 3.3.11)."""
+    value = _ICS_ESCAPE_RE.sub(r"\\\1", value or "")
+    return _ICS_NEWLINE_RE.sub(r"\\n", value)
 
-    return f"""BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//Zijin Assistant//EN
-CALSCALE:GREGORIAN
-METHOD:PUBLISH
-BEGIN:VEVENT
-UID:{uid}
-DTSTAMP:{now_utc}
-DTSTART:{dtstart}
-DTEND:{dtend}
-SUMMARY:{summary}
-LOCATION:{location}
-DESCRIPTION:{description}
-END:VEVENT
-END:VCALENDAR
-"""
+
+def _fold_line(line: str) -> str:
+    """Fold a content line to 75 octets without splitting UTF-8 characters (RFC 5545 3.1)."""
+    if len(line.encode("utf-8")) <= _ICS_FOLD_OCTETS:
+        return line
+
+    parts: List[str] = []
+    current = ""
+    size = 0
+    limit = _ICS_FOLD_OCTETS
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > limit:
+            parts.append(current)
+            # continuation lines start with a space, which counts toward the limit
+            current, size, limit = ch, n, _ICS_FOLD_OCTETS - 1
+        else:
+            current += ch
+            size += n
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def _new_uid() -> str:
+    return f"{uuid.uuid4()}@{UID_DOMAIN}"
+
+
+def _utc_to_ics(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _local_to_ics(dt: datetime) -> str:
+    return dt.strftime("%Y%m%dT%H%M%S")
+
+
+def _format_offset(offset: timedelta) -> str:
+    total = int(offset.total_seconds())
+    sign = "+" if total >= 0 else "-"
+    total = abs(total)
+    hours, rem = divmod(total, 3600)
+    minutes, seconds = divmod(rem, 60)
+    out = f"{sign}{hours:02d}{minutes:02d}"
+    return out + (f"{seconds:02d}" if seconds else "")
+
+
+def _load_zone(tzid: str) -> Optional[ZoneInfo]:
+    if not tzid:
+        return None
+    try:
+        return ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def _find_transition(tz: ZoneInfo, lo: datetime, hi: datetime) -> datetime:
+    # Bisect (UTC) down to the minute where the offset changes
+    before = lo.astimezone(tz).utcoffset()
+    while hi - lo > timedelta(minutes=1):
+        mid = lo + (hi - lo) / 2
+        if mid.astimezone(tz).utcoffset() == before:
+            lo = mid
+        else:
+            hi = mid
+    return hi.replace(second=0, microsecond=0)
+
+
+@lru_cache(maxsize=256)
+def _zone_transitions(tzid: str, year: int) -> Tuple[Tuple[str, ...], ...]:
+    """
+    STANDARD/DAYLIGHT observances for every UTC offset change of `tzid` in `year`.
+    Cached: each zone/year is computed once per process.
+    """
+    tz = _load_zone(tzid)
+    if tz is None:
+        return ()
+
+    components: List[Tuple[str, ...]] = []
+    cursor = datetime(year, 1, 1, tzinfo=timezone.utc)
+    year_end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    while cursor < year_end:
+        step = min(cursor + timedelta(days=1), year_end)
+        off_from = cursor.astimezone(tz).utcoffset()
+        if step.astimezone(tz).utcoffset() != off_from:
+            onset = _find_transition(tz, cursor, step)
+            local = onset.astimezone(tz)
+            kind = "DAYLIGHT" if local.dst() else "STANDARD"
+            components.append((
+                f"BEGIN:{kind}",
+                f"DTSTART:{_local_to_ics((onset + off_from).replace(tzinfo=None))}",
+                f"TZOFFSETFROM:{_format_offset(off_from)}",
+                f"TZOFFSETTO:{_format_offset(local.utcoffset())}",
+                f"TZNAME:{_ics_escape(local.tzname() or tzid)}",
+                f"END:{kind}",
+            ))
+        cursor = step
+    return tuple(components)
+
+
+@lru_cache(maxsize=128)
+def _build_vtimezone(tzid: str, first_year: int, last_year: int) -> Tuple[str, ...]:
+    """
+    VTIMEZONE block for `tzid` covering [first_year, last_year].
+    The previous year is included so events before the first transition
+    of `first_year` still resolve to an observance.
+    """
+    tz = _load_zone(tzid)
+    if tz is None:
+        return ()
+
+    lines: List[str] = ["BEGIN:VTIMEZONE", f"TZID:{tzid}"]
+    observances = [c for y in range(first_year - 1, last_year + 1) for c in _zone_transitions(tzid, y)]
+    if not observances:
+        # Fixed-offset zone (e.g. Asia/Tokyo): a single STANDARD observance
+        ref = datetime(first_year, 1, 1, tzinfo=timezone.utc).astimezone(tz)
+        offset = _format_offset(ref.utcoffset())
+        observances = [(
+            "BEGIN:STANDARD",
+            "DTSTART:19700101T000000",
+            f"TZOFFSETFROM:{offset}",
+            f"TZOFFSETTO:{offset}",
+            f"TZNAME:{_ics_escape(ref.tzname() or tzid)}",
+            "END:STANDARD",
+        )]
+    for comp in observances:
+        lines.extend(comp)
+    lines.append("END:VTIMEZONE")
+    return tuple(lines)
+
+
+def _event_tzid(event: Dict[str, Any]) -> str:
+    """TZID for naive start/end times, or "" (aware -> UTC, unknown -> floating)."""
+    start = event["start"]
+    if start.tzinfo is not None:
+        return ""
+    tzid = (event.get("timezone") or "").strip()
+    return tzid if _load_zone(tzid) is not None else ""
+
+
+def _dt_property(name: str, dt: datetime, tzid: str) -> str:
+    if dt.tzinfo is not None:
+        return f"{name}:{_utc_to_ics(dt)}"
+    if tzid:
+        return f"{name};TZID={tzid}:{_local_to_ics(dt)}"
+    # No zone known: floating local time rather than mislabeling it as UTC
+    return f"{name}:{_local_to_ics(dt)}"
+
+
+def _vevent_lines(event: Dict[str, Any], tzid: str, dtstamp: str) -> List[str]:
+    start: datetime = event["start"]
+    end: datetime = event.get("end") or (start + timedelta(minutes=30))
+    if start.tzinfo is None and end.tzinfo is not None:
+        # Convert (not relabel) an aware end into start's zone when known
+        if tzid:
+            end = end.astimezone(ZoneInfo(tzid)).replace(tzinfo=None)
+        else:
+            # Floating start has no frame to convert into; keep end's wall time
+            end = end.replace(tzinfo=None)
+    elif start.tzinfo is not None and end.tzinfo is None:
+        # A naive end carries no offset of its own; read it in start's zone
+        end = end.replace(tzinfo=start.tzinfo)
+    if end <= start:
+        end = start + timedelta(minutes=30)
+
+    summary = (event.get("title") or "Event").strip()
+    location = (event.get("location") or "").strip()
+    description = (event.get("description") or "").strip()
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.get('uid') or _new_uid()}",
+        f"DTSTAMP:{dtstamp}",
+        _dt_property("DTSTART", start, tzid),
+        _dt_property("DTEND", end, tzid),
+        f"SUMMARY:{_ics_escape(summary)}",
+    ]
+    if location:
+        lines.append(f"LOCATION:{_ics_escape(location)}")
+    if description:
+        lines.append(f"DESCRIPTION:{_ics_escape(description)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def build_ics_from_events(events: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Build one VCALENDAR containing a VEVENT per event.
+    Event keys: title, start, end, location, description, optional timezone/uid.
+    Naive datetimes with a known `timezone` get TZID + a shared VTIMEZONE;
+    aware datetimes are emitted in UTC.
+    """
+    events = [e for e in (events or []) if isinstance(e, dict) and isinstance(e.get("start"), datetime)]
+    if not events:
+        return None
+
+    dtstamp = _utc_to_ics(datetime.now(timezone.utc))
+
+    tzids: List[str] = []
+    years: Dict[str, List[int]] = {}
+    vevents: List[str] = []
+    for event in events:
+        tzid = _event_tzid(event)
+        if tzid:
+            if tzid not in years:
+                tzids.append(tzid)
+                years[tzid] = []
+            years[tzid].append(event["start"].year)
+            if event.get("end"):
+                years[tzid].append(event["end"].year)
+        vevents.extend(_vevent_lines(event, tzid, dtstamp))
+
+    lines: List[str] = list(_CALENDAR_HEADER)
+    for tzid in tzids:
+        lines.extend(_build_vtimezone(tzid, min(years[tzid]), max(years[tzid])))
+    lines.extend(vevents)
+    lines.extend(_CALENDAR_FOOTER)
+
+    return "\r\n".join(_fold_line(line) for line in lines) + "\r\n"
+
+
+def build_ics_from_event(event: Dict[str, Any]) -> Optional[str]:
+    return build_ics_from_events([event])
 
 
 def detect_event_and_build_ics(subject: str, body: str) -> Optional[str]:
@@ -123,17 +340,14 @@ def detect_event_and_build_ics(subject: str, body: str) -> Optional[str]:
     return build_ics_from_event(event)
 
 
-def build_ics_from_calendar_event(calendar_event: Dict[str, Any]) -> Optional[str]:
-    """
-    Build ICS from LLM structured calendar_event if present.
-    Expected keys: title, start_datetime, end_datetime, location, description
-    """
+def _calendar_event_to_event(calendar_event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if not isinstance(calendar_event, dict):
         return None
 
     title = (calendar_event.get("title") or "").strip() or "Event"
     start_s = (calendar_event.get("start_datetime") or "").strip()
     end_s = (calendar_event.get("end_datetime") or "").strip()
+    tz = (calendar_event.get("timezone") or "").strip()
     location = (calendar_event.get("location") or "").strip()
     description = (calendar_event.get("description") or "").strip()
 
@@ -144,13 +358,35 @@ def build_ics_from_calendar_event(calendar_event: Dict[str, Any]) -> Optional[st
     if not start_dt:
         return None
 
-    end_dt = dateparser.parse(end_s) if end_s else (start_dt + timedelta(minutes=30))
+    end_dt = dateparser.parse(end_s) if end_s else None
+    if not end_dt:
+        end_dt = start_dt + timedelta(minutes=30)
 
-    event = {
+    return {
         "title": title,
         "start": start_dt,
         "end": end_dt,
+        "timezone": tz,
         "location": location,
         "description": description,
     }
-    return build_ics_from_event(event)
\ No newline at end of file
+
+
+def build_ics_from_calendar_event(calendar_event: Dict[str, Any]) -> Optional[str]:
+    """
+    Build ICS from LLM structured calendar_event if present.
+    Expected keys: title, start_datetime, end_datetime, timezone, location, description
+    """
+    event = _calendar_event_to_event(calendar_event)
+    if not event:
+        return None
+    return build_ics_from_event(event)
+
+
+def build_ics_from_calendar_events(calendar_events: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Batch variant (digests, multi-session schedules): one VCALENDAR for all
+    usable calendar_events; unusable entries are skipped.
+    """
+    events = [e for e in (_calendar_event_to_event(c) for c in calendar_events or []) if e]
+    return build_ics_from_events(events)
@@ -0,0 +1,206 @@
+# email_assistant/services/email_classifier.py
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv(".env")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = (os.getenv(name, "") or "").strip().lower()
+    if not raw:
+        return default
+    return raw not in {"0", "false", "no", "off"}
+
+
+# Tier-1 routing thresholds (override via env vars)
+CLASSIFIER_ENABLED = _env_bool("CLASSIFIER_ENABLED", True)
+# Top category must hold at least this share of the total score to be trusted
+CLASSIFIER_MIN_CONFIDENCE = _env_float("CLASSIFIER_MIN_CONFIDENCE", 0.6)
+# Below this total score nothing was recognized -> ambiguous
+CLASSIFIER_MIN_SCORE = _env_float("CLASSIFIER_MIN_SCORE", 2.0)
+# A date+time pair escalates (likely event) unless the mail is routine
+# (billing/fyi) with at least this confidence, e.g. an order timestamp
+CLASSIFIER_DATETIME_SKIP_CONFIDENCE = _env_float("CLASSIFIER_DATETIME_SKIP_CONFIDENCE", 0.8)
+
+# Categories worth the LLM call even when the local tier is confident
+ESCALATE_CATEGORIES = {"event", "scheduling", "action_required"}
+# Categories where a date+time is usually a timestamp, not an event
+ROUTINE_CATEGORIES = {"billing", "fyi"}
+
+# Same category values the LLM returns (see llm_extractor._normalize_forward_pkg)
+_KEYWORDS: Dict[str, List[str]] = {
+    "event": [
+        "event", "rsvp", "tickets", "webinar", "conference", "workshop",
+        "concert", "invitation", "you're invited", "join us", "doors open",
+        "register", "registration",
+    ],
+    "scheduling": [
+        "meeting", "your availability", "are you available", "reschedule",
+        "calendar invite", "zoom", "google meet", "microsoft teams", "1:1",
+        "team sync", "a call", "quick call", "time slot",
+    ],
+    "action_required": [
+        "action required", "please respond", "please reply", "respond by",
+        "deadline", "due by", "due date", "please sign", "please approve",
+        "please confirm", "verify your", "asap", "urgent",
+    ],
+    "billing": [
+        "receipt", "invoice", "payment", "order #", "your order", "order total",
+        "order number", "subtotal", "amount charged", "refund", "billing",
+        "has shipped", "tracking number", "out for delivery", "was delivered",
+        "has been delivered",
+    ],
+    "fyi": [
+        "newsletter", "unsubscribe", "view in browser", "view this email",
+        "weekly digest", "announcement", "no-reply", "noreply",
+        "do not reply", "manage preferences",
+    ],
+    "recruiting": [
+        "interview", "application", "applied", "position", "recruiter",
+        "candidate", "job", "offer letter", "hiring", "resume",
+    ],
+    "personal": [
+        "hi mom", "hi dad", "love,", "miss you", "family", "birthday",
+        "dinner", "weekend",
+    ],
+}
+
+def _keyword_re(keyword: str) -> "re.Pattern[str]":
+    # Word boundaries only on word-character ends, so "order #" still hits "order #1234"
+    head = r"(?<!\w)" if re.match(r"\w", keyword) else ""
+    tail = r"(?!\w)" if re.search(r"\w$", keyword) else ""
+    return re.compile(head + re.escape(keyword) + tail)
+
+
+_KEYWORD_RES: Dict[str, List["re.Pattern[str]"]] = {
+    cat: [_keyword_re(k) for k in words]
+    for cat, words in _KEYWORDS.items()
+}
+
+# Full names or real abbreviations only; "may" needs an ordinal/year to
+# not be read as the verb ("may 3 items")
+_MONTH = (
+    r"(?:january|february|march|april|june|july|august|september|october|november|december"
+    r"|jan|feb|mar|apr|jun|jul|aug|sept|sep|oct|nov|dec)\.?"
+)
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?"
+_MAY_DATE = r"may\s+\d{1,2}(?:st|nd|rd|th|,?\s+\d{4})"
+# Ambiguous short forms (sat, sun, wed) must be spelled out
+_WEEKDAY = (
+    r"(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|mon|tues|tue|thurs|thur|thu|fri)\.?"
+)
+_DATE_RE = re.compile(
+    rf"\b(?:{_MONTH}\s+{_DAY}|{_DAY}\s+{_MONTH}|{_MAY_DATE}"
+    rf"|\d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?|\d{{4}}-\d{{2}}-\d{{2}}"
+    rf"|{_WEEKDAY}|today|tomorrow|tonight)(?!\w)"
+)
+_TIME_RE = re.compile(r"\b(?:\d{1,2}(?::\d{2})?\s?(?:am|pm|a\.m\.|p\.m\.)|\d{1,2}:\d{2}|noon|midnight)(?!\w)")
+_URL_RE = re.compile(r"https?://[^\s)>\"']+")
+_MONEY_RE = re.compile(r"[$€£]\s?\d")
+
+_ROUTING_COUNTS: Counter = Counter()
+
+
+def _score_categories(text: str) -> Dict[str, float]:
+    scores: Dict[str, float] = {}
+    for cat, patterns in _KEYWORD_RES.items():
+        hits = sum(1 for p in patterns if p.search(text))
+        if hits:
+            scores[cat] = float(hits)
+    return scores
+
+
+def classify_email(
+    subject: str,
+    body: str,
+    min_confidence: Optional[float] = None,
+    min_score: Optional[float] = None,
+    datetime_skip_confidence: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Cheap local first tier: score the email per category and decide
+    whether it is worth sending to the LLM.
+
+    Returns {category, confidence, needs_llm, reason, features}.
+    """
+    if min_confidence is None:
+        min_confidence = CLASSIFIER_MIN_CONFIDENCE
+    if min_score is None:
+        min_score = CLASSIFIER_MIN_SCORE
+    if datetime_skip_confidence is None:
+        datetime_skip_confidence = CLASSIFIER_DATETIME_SKIP_CONFIDENCE
+
+    subject_l = (subject or "").lower()
+    body_l = (body or "").lower()
+
+    # Subject hits count double: senders put the gist there
+    scores = _score_categories(body_l)
+    for cat, s in _score_categories(subject_l).items():
+        scores[cat] = scores.get(cat, 0.0) + 2 * s
+
+    has_date = bool(_DATE_RE.search(subject_l) or _DATE_RE.search(body_l))
+    has_time = bool(_TIME_RE.search(subject_l) or _TIME_RE.search(body_l))
+    n_links = len(set(_URL_RE.findall(body or "")))
+
+    if _MONEY_RE.search(body_l):
+        scores["billing"] = scores.get("billing", 0.0) + 1
+    # Link-heavy mail is almost always a newsletter/promo
+    if n_links >= 5:
+        scores["fyi"] = scores.get("fyi", 0.0) + 1
+
+    total = sum(scores.values())
+    if total:
+        category = max(scores, key=lambda c: scores[c])
+        confidence = scores[category] / total
+    else:
+        category, confidence = "fyi", 0.0
+
+    if category in ESCALATE_CATEGORIES:
+        needs_llm, reason = True, f"high_value:{category}"
+    elif has_date and has_time and not (
+        category in ROUTINE_CATEGORIES and confidence >= datetime_skip_confidence
+    ):
+        # A concrete date+time is the strongest event signal we have locally
+        needs_llm, reason = True, "date_time"
+    elif total < min_score:
+        needs_llm, reason = True, "low_score"
+    elif confidence < min_confidence:
+        needs_llm, reason = True, "low_confidence"
+    else:
+        needs_llm, reason = False, f"confident:{category}"
+
+    return {
+        "category": category,
+        "confidence": round(confidence, 3),
+        "needs_llm": needs_llm,
+        "reason": reason,
+        "features": {
+            "scores": scores,
+            "has_date": has_date,
+            "has_time": has_time,
+            "n_links": n_links,
+        },
+    }
+
+
+def record_routing(decision: str) -> None:
+    """Count a routing decision (e.g. "llm", "local", "empty")."""
+    _ROUTING_COUNTS[decision] += 1
+
+
+def get_routing_stats() -> Dict[str, int]:
+    stats = dict(_ROUTING_COUNTS)
+    stats["total"] = sum(_ROUTING_COUNTS.values())
+    return stats
@@ -14,6 +14,8 @@ try:
 except ImportError:
     OpenAI = None
 
+from services.email_classifier import CLASSIFIER_ENABLED, classify_email, record_routing
+
 load_dotenv(".env")
 
 
@@ -137,7 +139,7 @@ def _heuristic_calendar_event(subject: str, body: str) -> Optional[Dict[str, str
     }
 
 
-def _fallback_forward_package(subject: str, body: str) -> Dict[str, Any]:
+def _fallback_forward_package(subject: str, body: str, category: str = "fyi") -> Dict[str, Any]:
     clean = _clean_email_body(body or "")
     one_line = clean.replace("\n", " ").strip()
     snippet = one_line[:240] + ("…" if len(one_line) > 240 else "")
@@ -148,7 +150,7 @@ def _fallback_forward_package(subject: str, body: str) -> Dict[str, Any]:
     has_cal = bool(cal and cal.get("start_datetime"))
 
     return {
-        "category": "fyi",
+        "category": category,
         "forward_subject": f"{subject} – Key Info" if subject else "Fwd: Key Info",
         "tone": "short",
         "key_points": [snippet] if snippet else ["(No email content found.)"],
@@ -246,11 +248,24 @@ def build_forward_package(subject: str, body: str) -> Dict[str, Any]:
     cleaned_body = _clean_email_body(raw_body)
 
     if not cleaned_body.strip():
+        record_routing("empty")
         return _fallback_forward_package(subject, raw_body)
 
+    # Tier 1: cheap local classifier; only escalate ambiguous/high-value mail
+    category = "fyi"
+    if CLASSIFIER_ENABLED:
+        route = classify_email(subject, cleaned_body)
+        print(f"[Router] category={route['category']} confidence={route['confidence']} "
+              f"needs_llm={route['needs_llm']} reason={route['reason']}")
+        category = route["category"]
+        if not route["needs_llm"]:
+            record_routing("local")
+            return _fallback_forward_package(subject, raw_body, category=category)
+
     api_key = os.getenv("OPENAI_API_KEY")
     if OpenAI is None or not api_key:
-        return _fallback_forward_package(subject, raw_body)
+        record_routing("no_llm_available")
+        return _fallback_forward_package(subject, raw_body, category=category)
 
     try:
         client: "OpenAI" = OpenAI(api_key=api_key)
@@ -292,10 +307,14 @@ Rules:
         data = json.loads(raw_text)
 
         if not isinstance(data, dict):
-            return _fallback_forward_package(subject, raw_body)
+            record_routing("llm_error")
+            return _fallback_forward_package(subject, raw_body, category=category)
 
-        return _normalize_forward_pkg(data, subject, raw_body)
+        pkg = _normalize_forward_pkg(data, subject, raw_body)
+        record_routing("llm")
+        return pkg
 
     except Exception as e:
         print("[LLM] Error -> fallback:", repr(e))
-        return _fallback_forward_package(subject, raw_body)
\ No newline at end of file
+        record_routing("llm_error")
+        return _fallback_forward_package(subject, raw_body, category=category)
\ No newline at end of file
@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta, timezone
+
+from services.calendar_generator import (
+    _build_vtimezone,
+    _fold_line,
+    _ics_escape,
+    _zone_transitions,
+    build_ics_from_calendar_events,
+    build_ics_from_event,
+    build_ics_from_events,
+)
+
+
+def _lines(ics: str) -> list:
+    assert ics.endswith("\r\n")
+    body = ics[:-2]
+    # every line break is CRLF: no stray LF/CR left after splitting
+    lines = body.split("\r\n")
+    assert not any("\n" in line or "\r" in line for line in lines)
+    return lines
+
+
+def _unfold(ics: str) -> list:
+    return ics.replace("\r\n ", "").rstrip("\r\n").split("\r\n")
+
+
+def _prop(ics: str, name: str) -> list:
+    return [line for line in _unfold(ics) if line.split(":", 1)[0].split(";", 1)[0] == name]
+
+
+def test_escape_text_values():
+    assert _ics_escape("a,b;c\\d") == "a\\,b\\;c\\\\d"
+    assert _ics_escape("one\r\ntwo\nthree") == "one\\ntwo\\nthree"
+
+
+def test_fold_multibyte_within_75_octets():
+    line = "DESCRIPTION:" + "é" * 100 + "日本語" * 20
+    folded = _fold_line(line)
+    parts = folded.split("\r\n")
+    assert len(parts) > 1
+    assert max(len(p.encode("utf-8")) for p in parts) <= 75
+    assert all(p.startswith(" ") for p in parts[1:])
+    # unfolding restores the original line, so no character was split
+    assert folded.replace("\r\n ", "") == line
+
+
+def test_calendar_crlf_and_longest_line():
+    ics = build_ics_from_event({
+        "title": "Talk, part 1; intro",
+        "start": datetime(2026, 3, 1, 10),
+        "end": datetime(2026, 3, 1, 11),
+        "description": "Line one\nLine two " + "ü" * 80,
+    })
+    lines = _lines(ics)
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-1] == "END:VCALENDAR"
+    assert max(len(line.encode("utf-8")) for line in lines) <= 75
+    assert _prop(ics, "SUMMARY") == ["SUMMARY:Talk\\, part 1\\; intro"]
+
+
+def test_two_events_share_one_vtimezone():
+    ics = build_ics_from_events([
+        {"title": "A", "start": datetime(2026, 3, 1, 10), "end": datetime(2026, 3, 1, 11),
+         "timezone": "America/New_York"},
+        {"title": "B", "start": datetime(2026, 11, 5, 9), "end": datetime(2026, 11, 5, 10),
+         "timezone": "America/New_York"},
+    ])
+    uids = _prop(ics, "UID")
+    assert len(uids) == 2 and len(set(uids)) == 2
+    assert _prop(ics, "TZID") == ["TZID:America/New_York"]
+    assert ics.count("BEGIN:VTIMEZONE") == 1
+    assert _prop(ics, "DTSTART")[-2:] == [
+        "DTSTART;TZID=America/New_York:20260301T100000",
+        "DTSTART;TZID=America/New_York:20261105T090000",
+    ]
+
+
+def test_vtimezone_dst_transitions_and_cache():
+    _zone_transitions.cache_clear()
+    _build_vtimezone.cache_clear()
+
+    lines = _build_vtimezone("America/New_York", 2026, 2026)
+    assert lines[0] == "BEGIN:VTIMEZONE" and lines[-1] == "END:VTIMEZONE"
+    assert "DTSTART:20260308T020000" in lines
+    assert "DTSTART:20261101T020000" in lines
+    assert "TZOFFSETTO:-0400" in lines and "TZOFFSETTO:-0500" in lines
+
+    assert _build_vtimezone("America/New_York", 2026, 2026) is lines
+    assert _build_vtimezone.cache_info().hits == 1
+    # previous year is included so early-January events resolve
+    assert _zone_transitions.cache_info().currsize == 2
+
+
+def test_vtimezone_fixed_offset_zone():
+    lines = _build_vtimezone("Asia/Tokyo", 2026, 2026)
+    assert "BEGIN:STANDARD" in lines
+    assert "TZOFFSETTO:+0900" in lines
+    assert "BEGIN:DAYLIGHT" not in lines
+
+
+def test_aware_times_emitted_in_utc():
+    tz = timezone(timedelta(hours=-4))
+    ics = build_ics_from_event({
+        "title": "A",
+        "start": datetime(2026, 10, 20, 15, tzinfo=tz),
+        "end": datetime(2026, 10, 20, 16, tzinfo=tz),
+    })
+    assert _prop(ics, "DTSTART") == ["DTSTART:20261020T190000Z"]
+    assert _prop(ics, "DTEND") == ["DTEND:20261020T200000Z"]
+    assert "BEGIN:VTIMEZONE" not in ics
+
+
+def test_naive_without_zone_is_floating():
+    ics = build_ics_from_event({
+        "title": "A",
+        "start": datetime(2026, 10, 20, 15),
+        "end": datetime(2026, 10, 20, 16),
+        "timezone": "Not/A_Zone",
+    })
+    assert _prop(ics, "DTSTART") == ["DTSTART:20261020T150000"]
+    assert _prop(ics, "DTEND") == ["DTEND:20261020T160000"]
+    assert "BEGIN:VTIMEZONE" not in ics
+
+
+def test_aware_end_converted_into_start_zone():
+    ics = build_ics_from_event({
+        "title": "A",
+        "start": datetime(2026, 11, 1, 9),
+        "end": datetime(2026, 11, 1, 10, tzinfo=timezone(timedelta(hours=-8))),
+        "timezone": "America/New_York",
+    })
+    assert _prop(ics, "DTEND") == ["DTEND;TZID=America/New_York:20261101T130000"]
+
+
+
+def test_aware_end_with_floating_start_keeps_wall_time():
+    ics = build_ics_from_event({
+        "title": "A",
+        "start": datetime(2026, 11, 1, 9),
+        "end": datetime(2026, 11, 1, 10, tzinfo=timezone(timedelta(hours=-8))),
+    })
+    assert _prop(ics, "DTSTART") == ["DTSTART:20261101T090000"]
+    assert _prop(ics, "DTEND") == ["DTEND:20261101T100000"]
+
+
+def test_end_before_start_clamped():
+    ics = build_ics_from_event({
+        "title": "A",
+        "start": datetime(2026, 5, 1, 9),
+        "end": datetime(2026, 5, 1, 8),
+    })
+    assert _prop(ics, "DTEND") == ["DTEND:20260501T093000"]
+
+
+def test_calendar_events_skip_unusable_entries():
+    ics = build_ics_from_calendar_events([
+        {"title": "Session 1", "start_datetime": "2026-10-20T15:00:00", "timezone": "Europe/London"},
+        {"title": "No start"},
+        "not a dict",
+    ])
+    assert ics.count("BEGIN:VEVENT") == 1
+    assert _prop(ics, "DTSTART")[-1] == "DTSTART;TZID=Europe/London:20261020T150000"
+    assert build_ics_from_calendar_events([{"title": "No start"}]) is None
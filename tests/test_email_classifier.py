@@ -0,0 +1,124 @@
+from collections import Counter
+
+import pytest
+
+from services import email_classifier
+from services.email_classifier import (
+    _DATE_RE,
+    _env_bool,
+    _env_float,
+    _score_categories,
+    classify_email,
+    get_routing_stats,
+    record_routing,
+)
+
+
+def test_receipt_routed_locally():
+    route = classify_email(
+        "Your order has shipped",
+        "Your order #1234 has shipped. Order total: $23.10. Tracking number: 1Z999.",
+    )
+    assert route["category"] == "billing"
+    assert route["needs_llm"] is False
+    assert route["reason"] == "confident:billing"
+
+
+def test_delivery_reminder_not_escalated():
+    route = classify_email("Reminder: your package was delivered", "Your order #42 was delivered.")
+    assert route["category"] == "billing"
+    assert route["needs_llm"] is False
+
+
+
+@pytest.mark.parametrize("text", ["order #1234 confirmed", "order # 1234 confirmed"])
+def test_order_hash_keyword_matches(text):
+    assert _score_categories(text) == {"billing": 1.0}
+
+
+def test_keywords_keep_word_boundaries():
+    assert _score_categories("in order to proceed") == {}
+    assert _score_categories("prepayments") == {}
+
+
+def test_date_time_invite_escalated():
+    route = classify_email("Dinner Saturday?", "Want to grab dinner Saturday at 7pm?")
+    assert route["features"]["has_date"] and route["features"]["has_time"]
+    assert route["needs_llm"] is True
+    assert route["reason"] == "date_time"
+
+
+def test_routine_date_time_skip_threshold():
+    subject, body = "Your receipt", "Payment received Oct 12 at 3:45pm. Order total $20."
+    assert classify_email(subject, body)["needs_llm"] is False
+    # Raising the threshold above any possible confidence escalates it
+    route = classify_email(subject, body, datetime_skip_confidence=1.1)
+    assert route["reason"] == "date_time"
+
+
+def test_empty_score_is_low_score():
+    route = classify_email("hey", "what's up")
+    assert route["confidence"] == 0.0
+    assert route["needs_llm"] is True
+    assert route["reason"] == "low_score"
+
+
+def test_min_score_threshold():
+    route = classify_email("", "Here is your receipt.", min_score=0.5)
+    assert route["reason"] == "confident:billing"
+    route = classify_email("", "Here is your receipt.", min_score=5)
+    assert route["reason"] == "low_score"
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["money back", "monthly", "satisfaction", "friends", "wedding", "sunny",
+     "decide 12", "market 5", "may 3 items", "option 2 may be"],
+)
+def test_date_regex_ignores_lookalike_words(text):
+    assert not _DATE_RE.search(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["saturday", "fri.", "oct 22", "22 march", "may 3rd", "may 3, 2026", "10/22", "2026-10-22", "tomorrow"],
+)
+def test_date_regex_matches_dates(text):
+    assert _DATE_RE.search(text)
+
+
+def test_env_parsing(monkeypatch):
+    monkeypatch.setenv("X_FLOAT", "0.25")
+    monkeypatch.setenv("X_BAD_FLOAT", "abc")
+    monkeypatch.setenv("X_OFF", "False")
+    monkeypatch.setenv("X_ON", "1")
+    monkeypatch.delenv("X_UNSET", raising=False)
+
+    assert _env_float("X_FLOAT", 0.6) == 0.25
+    assert _env_float("X_BAD_FLOAT", 0.6) == 0.6
+    assert _env_float("X_UNSET", 0.6) == 0.6
+    assert _env_bool("X_OFF", True) is False
+    assert _env_bool("X_ON", False) is True
+    assert _env_bool("X_UNSET", True) is True
+
+
+def test_routing_stats(monkeypatch):
+    monkeypatch.setattr(email_classifier, "_ROUTING_COUNTS", Counter())
+    record_routing("local")
+    record_routing("local")
+    record_routing("llm")
+    record_routing("llm_error")
+
+    assert get_routing_stats() == {"local": 2, "llm": 1, "llm_error": 1, "total": 4}
+
+
+def test_fallback_keeps_routed_category(monkeypatch):
+    from services import llm_extractor
+
+    monkeypatch.setattr(email_classifier, "_ROUTING_COUNTS", Counter())
+    monkeypatch.setattr(llm_extractor, "CLASSIFIER_ENABLED", True)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    pkg = llm_extractor.build_forward_package("Dinner Saturday?", "Want to grab dinner Saturday at 7pm?")
+    assert pkg["category"] == "personal"
+    assert get_routing_stats() == {"no_llm_available": 1, "total": 1}